@@ -2,16 +2,183 @@ import subprocess
 import os
 import hashlib
 import json
+import queue
+import threading
+import time
+import urllib.error
 import urllib.request
 import urllib.parse
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
+
+CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'commitpulse')
+AVATAR_CACHE_PATH = os.path.join(CACHE_DIR, 'avatars.json')
+
+# Bump whenever get_stats computes anything differently, so stats cached by an
+# older release are recomputed instead of reused
+STATS_CACHE_VERSION = 1
+
+# Concurrent GitHub lookups, kept low to respect the search API's secondary rate limits
+AVATAR_LOOKUP_WORKERS = 5
+# Longest Retry-After (seconds) we are willing to wait out before giving up on GitHub
+MAX_RETRY_AFTER = 10
+
+# Comprehensive language map (Extensions -> Language Name)
+# Sourced from industry standards for polyglot analysis
+LANG_MAP = {
+    '.py': 'Python', '.js': 'JavaScript', '.ts': 'TypeScript', '.tsx': 'React/TS', 
+    '.jsx': 'React/JS', '.html': 'HTML', '.css': 'CSS', '.go': 'Go', '.rs': 'Rust',
+    '.cpp': 'C++', '.c': 'C', '.h': 'C/C++', '.java': 'Java', '.rb': 'Ruby', 
+    '.php': 'PHP', '.cs': 'C#', '.swift': 'Swift', '.kt': 'Kotlin', '.m': 'Obj-C',
+    '.sql': 'SQL', '.sh': 'Shell', '.bat': 'Batch', '.ps1': 'PowerShell',
+    '.dart': 'Dart', '.lua': 'Lua', '.scala': 'Scala', '.pl': 'Perl',
+    '.r': 'R', '.jl': 'Julia', '.ex': 'Elixir', '.exs': 'Elixir',
+    '.yaml': 'YAML', '.yml': 'YAML', '.json': 'JSON', '.md': 'Markdown',
+    '.dockerfile': 'Docker', 'dockerfile': 'Docker', '.proto': 'Protobuf'
+}
+
+# Directories and files to strictly ignore
+IGNORE_DIRS = frozenset({
+    '.git', 'node_modules', 'venv', '.venv', 'env', '__pycache__', 
+    'build', 'dist', 'target', '.next', 'out', '.svelte-kit',
+    'vendor', 'bin', 'obj', '.vs', '.idea', '.vscode'
+})
+
+IGNORE_FILES = frozenset({
+    'package-lock.json', 'yarn.lock', 'pnpm-lock.yaml', 'composer.lock',
+    'poetry.lock', 'gemfile.lock', 'cargo.lock', 'mix.lock'
+})
+
+# Per-file byte cap so a single huge artifact can't dominate the language mix
+MAX_FILE_BYTES = 10_000_000
+
+# Data dumps and bundles above this size are treated as generated and skipped,
+# mirroring Linguist's generated-file heuristics
+GENERATED_FILE_BYTES = 50_000_000
+GENERATED_SUFFIXES = ('.json', '.sql', '.csv', '.min.js')
+
+# Leading bytes sniffed per file to spot binaries and minified bundles
+SNIFF_BYTES = 8192
+# Average line length above which a file is treated as minified/generated
+MAX_AVG_LINE_LENGTH = 500
+
+# Extension-only view of LANG_MAP, built once at import for the walk's first lookup
+_EXT_LANG = {k: v for k, v in LANG_MAP.items() if k.startswith('.')}
+
+# Worker threads for the language-detection walk
+WALK_WORKERS = min(os.cpu_count() or 1, 16)
+
+def _load_avatar_cache():
+    try:
+        with open(AVATAR_CACHE_PATH, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+        return cache if isinstance(cache, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+def _save_avatar_cache(updates):
+    cache = _load_avatar_cache()
+    cache.update(updates)
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        # Write then rename so concurrent --scan workers never see a partial file
+        tmp_path = f"{AVATAR_CACHE_PATH}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(cache, f)
+        os.replace(tmp_path, AVATAR_CACHE_PATH)
+    except OSError:
+        pass
+
+@lru_cache(maxsize=65536)
+def _looks_text(path):
+    # Linguist-style sniff: NUL bytes mean binary, very long lines mean minified output
+    try:
+        with open(path, 'rb') as f:
+            buf = f.read(SNIFF_BYTES)
+    except OSError:
+        # Unreadable files keep the previous behaviour of being counted
+        return True
+    if b'\x00' in buf:
+        return False
+    return len(buf) <= MAX_AVG_LINE_LENGTH * max(buf.count(b'\n'), 1)
+
+def _count_language_bytes(root):
+    # Parallel scandir walk: workers share a queue of directories and each keeps
+    # its own Counter, merged at the end. scandir/stat release the GIL, so
+    # threads overlap filesystem latency on large or slow trees.
+    pending = queue.Queue()
+    pending.put(root)
+    counters = []
+
+    def worker():
+        languages = Counter()
+        counters.append(languages)
+        while True:
+            path = pending.get()
+            if path is None:
+                break
+            try:
+                with os.scandir(path) as it:
+                    for entry in it:
+                        if entry.is_dir(follow_symlinks=False):
+                            # Prune ignored directories
+                            if entry.name not in IGNORE_DIRS:
+                                pending.put(entry.path)
+                            continue
+                        
+                        f = entry.name.lower()
+                        if f in IGNORE_FILES or not entry.is_file(follow_symlinks=False):
+                            continue
+                        
+                        # Check extension, then direct filename (like Dockerfile or .dockerfile)
+                        lang = _EXT_LANG.get(os.path.splitext(f)[1])
+                        if lang is None:
+                            lang = LANG_MAP.get(f)
+                        
+                        if lang:
+                            # Weight by byte-count to mirror GitHub's Linguist accuracy
+                            try:
+                                size = entry.stat(follow_symlinks=False).st_size
+                            except OSError:
+                                # Fallback to simple increment if size can't be read
+                                size = 1
+                            if size > GENERATED_FILE_BYTES and f.endswith(GENERATED_SUFFIXES):
+                                continue
+                            if not _looks_text(entry.path):
+                                continue
+                            languages[lang] += min(size, MAX_FILE_BYTES)
+            except OSError:
+                pass
+            finally:
+                pending.task_done()
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(WALK_WORKERS)]
+    for t in threads:
+        t.start()
+    pending.join()
+    for _ in threads:
+        pending.put(None)
+    for t in threads:
+        t.join()
+
+    languages = Counter()
+    for c in counters:
+        languages.update(c)
+    return languages
 
 class GitAnalyzer:
-    def __init__(self, repo_path):
+    def __init__(self, repo_path, use_cache=True, persist_avatars=True):
         self.repo_path = os.path.abspath(repo_path)
         self.repo_name = os.path.basename(self.repo_path)
+        self.use_cache = use_cache
+        # --scan workers leave persisting to the parent so their writes can't clobber each other
+        self.persist_avatars = persist_avatars
         self.github_avatar_cache = {}
+        # Definitive GitHub answers from this run, persisted to the on-disk cache
+        self.new_avatars = {}
+        self._rate_limited = threading.Event()
 
     def _run_git(self, args):
         try:
@@ -26,62 +193,230 @@ class GitAnalyzer:
         except (subprocess.CalledProcessError, FileNotFoundError):
             return None
 
+    def _stream_git(self, args, chunk_size=65536):
+        # Yield NUL-delimited records from fixed-size binary reads,
+        # so large histories are never buffered whole
+        try:
+            proc = subprocess.Popen(
+                ['git'] + args,
+                cwd=self.repo_path,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL
+            )
+        except FileNotFoundError:
+            return
+        with proc:
+            tail = b''
+            while True:
+                chunk = proc.stdout.read(chunk_size)
+                if not chunk:
+                    break
+                records = (tail + chunk).split(b'\x00')
+                # The last piece may be cut mid-record; carry it into the next read
+                tail = records.pop()
+                for record in records:
+                    yield record.decode('utf-8', 'replace')
+            if tail:
+                yield tail.decode('utf-8', 'replace')
+
     def is_git_repo(self):
         return os.path.exists(os.path.join(self.repo_path, '.git'))
 
+    @staticmethod
+    def _gravatar_url(email):
+        try:
+            digest = hashlib.md5(email.lower().encode('utf-8'), usedforsecurity=False)
+        except TypeError:
+            # usedforsecurity is only accepted on Python 3.9+
+            digest = hashlib.md5(email.lower().encode('utf-8'))
+        return f"https://www.gravatar.com/avatar/{digest.hexdigest()}?d=identicon&s=150"
+
+    def _search_github_avatar(self, email):
+        # Returns (avatar_url or None, whether GitHub gave a definitive answer)
+        search_url = f"https://api.github.com/search/users?q={urllib.parse.quote(email)}"
+        for attempt in range(2):
+            request = urllib.request.Request(search_url)
+            request.add_header('User-Agent', 'CommitPulse-CLI-v0.1')
+            try:
+                with urllib.request.urlopen(request, timeout=5) as response:
+                    data = json.loads(response.read().decode())
+                    if response.headers.get('X-RateLimit-Remaining') == '0':
+                        self._rate_limited.set()
+                if data.get('total_count', 0) > 0:
+                    return data['items'][0]['avatar_url'], True
+                return None, True
+            except urllib.error.HTTPError as e:
+                if e.code in (403, 429):
+                    retry_after = e.headers.get('Retry-After') or ''
+                    if attempt == 0 and retry_after.isdigit() and int(retry_after) <= MAX_RETRY_AFTER:
+                        time.sleep(int(retry_after))
+                        continue
+                    self._rate_limited.set()
+                return None, False
+            except Exception:
+                # Silently fall back to Gravatar on any other error (network, malformed payload, etc)
+                return None, False
+        return None, False
+
     def _get_github_avatar(self, email):
         if email in self.github_avatar_cache:
             return self.github_avatar_cache[email]
         
-        # Default to Gravatar
-        email_hash = hashlib.md5(email.lower().encode('utf-8')).hexdigest()
-        avatar_url = f"https://www.gravatar.com/avatar/{email_hash}?d=identicon&s=150"
+        # Once GitHub throttles us, stop issuing requests for the rest of the run
+        github_url, definitive = None, False
+        if not self._rate_limited.is_set():
+            github_url, definitive = self._search_github_avatar(email)
         
+        # Only hash the email for Gravatar when GitHub has no avatar for it
+        avatar_url = github_url or self._gravatar_url(email)
+        self.github_avatar_cache[email] = avatar_url
+        if definitive:
+            self.new_avatars[email] = avatar_url
+        return avatar_url
+
+    def _lookup_avatar(self, email):
         try:
-            # Try to search for user by email using GitHub's public API
-            search_url = f"https://api.github.com/search/users?q={urllib.parse.quote(email)}"
-            request = urllib.request.Request(search_url)
-            request.add_header('User-Agent', 'CommitPulse-CLI-v0.1')
-            
-            with urllib.request.urlopen(request, timeout=5) as response:
-                data = json.loads(response.read().decode())
-                if data.get('total_count', 0) > 0:
-                    avatar_url = data['items'][0]['avatar_url']
+            return self._get_github_avatar(email)
         except Exception:
-            # Silently fall back to Gravatar on any error (rate limit, network, etc)
+            # One failed lookup must not abort the rest of the batch
+            return None
+
+    def _resolve_avatars(self, contributors):
+        emails = [c["email"] for c in contributors]
+        # Seed from the on-disk cache so repeated runs skip HTTP entirely
+        disk_cache = _load_avatar_cache()
+        for email in emails:
+            if email in disk_cache and email not in self.github_avatar_cache:
+                self.github_avatar_cache[email] = disk_cache[email]
+        
+        pending = [email for email in dict.fromkeys(emails) if email not in self.github_avatar_cache]
+        if pending:
+            with ThreadPoolExecutor(max_workers=AVATAR_LOOKUP_WORKERS) as executor:
+                list(executor.map(self._lookup_avatar, pending))
+            if self.persist_avatars:
+                self.save_avatar_cache(self.new_avatars)
+        
+        for c in contributors:
+            c["avatar"] = self.github_avatar_cache.get(c["email"]) or self._gravatar_url(c["email"])
+
+    def _start_avatar_thread(self, contributors):
+        avatar_thread = threading.Thread(target=self._resolve_avatars, args=(contributors,), daemon=True)
+        avatar_thread.start()
+        return avatar_thread
+
+    def _join_avatar_thread(self, avatar_thread, contributors):
+        avatar_thread.join()
+        # Errors in the resolver thread only reach stderr; never ship a missing avatar
+        for c in contributors:
+            if not c.get("avatar"):
+                c["avatar"] = self._gravatar_url(c["email"])
+
+    def _top_languages(self):
+        # Language Detection (Robust Byte-Count Analysis)
+        # Scan files using byte-count for precision
+        languages = _count_language_bytes(self.repo_path)
+        return [lang for lang, count in languages.most_common(5)]
+
+    def _stats_cache_key(self):
+        # Any new commit on any ref changes either HEAD or the total commit count
+        head = self._run_git(['rev-parse', 'HEAD'])
+        count = self._run_git(['rev-list', '--count', '--all'])
+        if not head or not count:
+            return None
+        return f"{STATS_CACHE_VERSION}:{head}:{count}"
+
+    def _stats_cache_path(self):
+        repo_hash = hashlib.sha1(self.repo_path.encode('utf-8')).hexdigest()
+        return os.path.join(CACHE_DIR, f"{repo_hash}.json")
+
+    def _load_cached_stats(self, key):
+        try:
+            with open(self._stats_cache_path(), 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(cached, dict) or cached.get('key') != key:
+            return None
+        stats = cached.get('stats')
+        if not isinstance(stats, dict) or not isinstance(stats.get("contributors"), list):
+            return None
+        # JSON turns the hour keys into strings; restore them
+        stats["hourly_distribution"] = {int(h): c for h, c in stats.get("hourly_distribution", {}).items()}
+        for c in stats["contributors"]:
+            c["avatar"] = None
+        return stats
+
+    def _save_cached_stats(self, key, stats):
+        # Only the history-derived part is keyed by HEAD; avatars and languages are
+        # recomputed on every cache hit
+        cached = dict(stats)
+        cached.pop("top_languages", None)
+        cached["contributors"] = [
+            {k: v for k, v in c.items() if k != "avatar"} for c in stats["contributors"]
+        ]
+        path = self._stats_cache_path()
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({"key": key, "stats": cached}, f)
+            os.replace(tmp_path, path)
+        except OSError:
             pass
-            
-        self.github_avatar_cache[email] = avatar_url
-        return avatar_url
 
     def get_stats(self):
         if not self.is_git_repo():
             return None
 
+        cache_key = self._stats_cache_key() if self.use_cache else None
+        if cache_key:
+            stats = self._load_cached_stats(cache_key)
+            if stats:
+                print(f"Analyzing {self.repo_name}... (cached, unchanged since last run)")
+                # Avatars depend on the network and languages on the working tree, so both are refreshed
+                avatar_thread = self._start_avatar_thread(stats["contributors"])
+                stats["top_languages"] = self._top_languages()
+                self._join_avatar_thread(avatar_thread, stats["contributors"])
+                return stats
+
         print(f"Analyzing {self.repo_name}... (High Precision)")
 
-        # Get all commit dates and times for heatmap and productivity
-        # Use --all to include all branches and --no-merges to match GitHub's default contribution view
-        # or remove --no-merges if we want every single commit. GitHub counts merges if they occurred on GitHub.
+        # Single pass over the full history: each commit is a NUL-prefixed "date <tab> name <tab> email"
+        # header for heatmap, productivity and contributors, followed by its
+        # "added <tab> deleted <tab> path" numstat lines for code churn (Lines added/deleted).
+        # git's default rename handling is kept so moved files don't inflate churn.
         # We'll stick to --all for full visibility.
-        commit_dates_raw = self._run_git(['log', '--all', '--format=%aI'])
-        
-        heatmap_data = Counter()
-        hourly_distribution = Counter()
-        
-        if commit_dates_raw:
-            dates = commit_dates_raw.split('\n')
-            for d in dates:
-                if not d: continue
-                try:
-                    dt = datetime.fromisoformat(d)
-                    date_str = dt.date().isoformat()
-                    hour = dt.hour
-                    
-                    heatmap_data[date_str] += 1
-                    hourly_distribution[hour] += 1
-                except ValueError:
-                    continue
+        all_timestamps = []
+        authors = Counter()
+        lines_added = 0
+        lines_deleted = 0
+
+        for record in self._stream_git(['log', '--all', '--no-show-signature', '--numstat', '--format=%x00%aI%x09%aN%x09%aE']):
+            header, _, numstat = record.partition('\n')
+
+            for line in numstat.split('\n'):
+                parts = line.split('\t', 2)
+                # Only count "added <tab> deleted <tab> path" rows; binary files report "-\t-"
+                # and anything else (e.g. notes from user log config) is skipped
+                if len(parts) != 3: continue
+                added, deleted, _ = parts
+                if not (added.isdecimal() and deleted.isdecimal()): continue
+                lines_added += int(added)
+                lines_deleted += int(deleted)
+
+            parts = header.split('\t')
+            if len(parts) != 3: continue
+            date, name, email = parts
+            authors[(name.strip(), email.strip())] += 1
+            try:
+                dt = datetime.fromisoformat(date)
+            except ValueError:
+                continue
+            all_timestamps.append(dt)
+
+        # Tally in one C-level pass each rather than per-line increments
+        heatmap_data = Counter(dt.date().isoformat() for dt in all_timestamps)
+        hourly_distribution = Counter(dt.hour for dt in all_timestamps)
 
         total_commits = sum(heatmap_data.values())
 
@@ -93,134 +428,39 @@ class GitAnalyzer:
             first_date = sorted_dates[0]
             last_date = sorted_dates[-1]
 
-        # Get contributors with high precision
-        # Format: count <tab> name <email>
-        shortlog = self._run_git(['shortlog', '-sne', '--all'])
-        contributors = []
-        if shortlog:
-            for line in shortlog.split('\n'):
-                line = line.strip()
-                if not line: continue
-                parts = line.split('\t')
-                if len(parts) == 2:
-                    count = int(parts[0].strip())
-                    name_email = parts[1].strip()
-                    name = name_email
-                    email = ""
-                    if '<' in name_email:
-                        name = name_email.split('<')[0].strip()
-                        email = name_email.split('<')[1].split('>')[0].strip()
-                    
-                    avatar = self._get_github_avatar(email)
-                    
-                    contributors.append({
-                        "name": name,
-                        "email": email,
-                        "commits": count,
-                        "avatar": avatar
-                    })
-
-        # Get code churn (Lines added/deleted)
-        # git log --shortstat --all: "N files changed, X insertions(+), Y deletions(-)"
-        lines_added = 0
-        lines_deleted = 0
-        shortstat_raw = self._run_git(['log', '--all', '--shortstat', '--format='])
-        if shortstat_raw:
-            for line in shortstat_raw.split('\n'):
-                line = line.strip()
-                if not line: continue
-                
-                # Format: "X insertions(+), Y deletions(-)"
-                if "insertions(+)" in line:
-                    try:
-                        pts = line.split(',')
-                        for p in pts:
-                            if "insertion" in p:
-                                lines_added += int(p.strip().split(' ')[0])
-                            if "deletion" in p:
-                                lines_deleted += int(p.strip().split(' ')[0])
-                    except: pass
+        # Contributors with high precision (mailmap-aware, like shortlog -sne)
+        contributors = [
+            {
+                "name": name,
+                "email": email,
+                "commits": count,
+                "avatar": None
+            }
+            for (name, email), count in authors.most_common()
+        ]
 
-        # Language Detection (Robust Byte-Count Analysis)
-        languages = Counter()
-        
-        # Comprehensive language map (Extensions -> Language Name)
-        # Sourced from industry standards for polyglot analysis
-        LANG_MAP = {
-            '.py': 'Python', '.js': 'JavaScript', '.ts': 'TypeScript', '.tsx': 'React/TS', 
-            '.jsx': 'React/JS', '.html': 'HTML', '.css': 'CSS', '.go': 'Go', '.rs': 'Rust',
-            '.cpp': 'C++', '.c': 'C', '.h': 'C/C++', '.java': 'Java', '.rb': 'Ruby', 
-            '.php': 'PHP', '.cs': 'C#', '.swift': 'Swift', '.kt': 'Kotlin', '.m': 'Obj-C',
-            '.sql': 'SQL', '.sh': 'Shell', '.bat': 'Batch', '.ps1': 'PowerShell',
-            '.dart': 'Dart', '.lua': 'Lua', '.scala': 'Scala', '.pl': 'Perl',
-            '.r': 'R', '.jl': 'Julia', '.ex': 'Elixir', '.exs': 'Elixir',
-            '.yaml': 'YAML', '.yml': 'YAML', '.json': 'JSON', '.md': 'Markdown',
-            '.dockerfile': 'Docker', 'dockerfile': 'Docker', '.proto': 'Protobuf'
-        }
+        # Resolve avatars in the background while the file walk and session math run
+        avatar_thread = self._start_avatar_thread(contributors)
 
-        # Directories and files to strictly ignore
-        IGNORE_DIRS = {
-            '.git', 'node_modules', 'venv', '.venv', 'env', '__pycache__', 
-            'build', 'dist', 'target', '.next', 'out', '.svelte-kit',
-            'vendor', 'bin', 'obj', '.vs', '.idea', '.vscode'
-        }
-        
-        IGNORE_FILES = {
-            'package-lock.json', 'yarn.lock', 'pnpm-lock.yaml', 'composer.lock',
-            'poetry.lock', 'gemfile.lock', 'cargo.lock', 'mix.lock'
-        }
-
-        # Scan files using byte-count for precision
-        for root, dirs, files in os.walk(self.repo_path):
-            # Prune ignored directories
-            dirs[:] = [d for d in dirs if d not in IGNORE_DIRS]
-            
-            for f in files:
-                if f in IGNORE_FILES:
-                    continue
-                    
-                full_path = os.path.join(root, f)
-                ext = os.path.splitext(f)[1].lower()
-                
-                # Check extension or direct filename (like Dockerfile)
-                lang = LANG_MAP.get(ext) or LANG_MAP.get(f.lower())
-                
-                if lang:
-                    try:
-                        # Weight by byte-count to mirror GitHub's Linguist accuracy
-                        size = os.path.getsize(full_path)
-                        languages[lang] += size
-                    except (OSError, PermissionError):
-                        # Fallback to simple increment if size can't be read
-                        languages[lang] += 1
-
-        top_languages = [lang for lang, count in languages.most_common(5)]
+        top_languages = self._top_languages()
 
         # Estimate Engineering Hours
         # Heuristic: Clustered sessions. Commits < 2hrs apart = same session.
         estimated_hours = 0
-        if commit_dates_raw:
-            # Sort full ISO timestamps
-            all_timestamps = []
-            for d in commit_dates_raw.split('\n'):
-                if not d: continue
-                try:
-                    all_timestamps.append(datetime.fromisoformat(d))
-                except: pass
+        if all_timestamps:
+            # Work on sorted epoch seconds: float subtraction is far cheaper than datetime math
+            ts = sorted(dt.timestamp() for dt in all_timestamps)
             
-            all_timestamps.sort()
+            session_start_buffer = 0.5 # 30 mins session prep
+            estimated_hours += session_start_buffer
             
-            if all_timestamps:
-                session_start_buffer = 0.5 # 30 mins session prep
-                estimated_hours += session_start_buffer
-                
-                for i in range(1, len(all_timestamps)):
-                    diff = (all_timestamps[i] - all_timestamps[i-1]).total_seconds() / 3600
-                    if diff < 2: # Within 2 hours
-                        estimated_hours += diff
-                    else:
-                        estimated_hours += session_start_buffer
+            estimated_hours += sum(
+                diff if diff < 2 else session_start_buffer # Within 2 hours
+                for diff in ((b - a) / 3600 for a, b in zip(ts, ts[1:]))
+            )
         
+        self._join_avatar_thread(avatar_thread, contributors)
+
         # Calculate most productive hour
         peak_hour = "N/A"
         if hourly_distribution:
@@ -239,7 +479,7 @@ class GitAnalyzer:
             elif 12 <= hour < 18: activity_segments["Afternoon"] += count
             else: activity_segments["Late Night"] += count
 
-        return {
+        stats = {
             "name": self.repo_name,
             "path": self.repo_path,
             "total_commits": total_commits,
@@ -256,22 +496,48 @@ class GitAnalyzer:
             "contributors": sorted(contributors, key=lambda x: x['commits'], reverse=True)
         }
 
+        if cache_key:
+            self._save_cached_stats(cache_key, stats)
+        return stats
+
     @staticmethod
     def scan_for_repos(root_dir, max_depth=3):
         repos = []
         root_dir = os.path.abspath(root_dir)
         
-        for dirpath, dirnames, filenames in os.walk(root_dir):
-            if '.git' in dirnames:
+        stack = [(root_dir, 0)]
+        while stack:
+            dirpath, depth = stack.pop()
+            subdirs = []
+            is_repo = False
+            try:
+                with os.scandir(dirpath) as it:
+                    for entry in it:
+                        if not entry.is_dir(follow_symlinks=False):
+                            continue
+                        if entry.name == '.git':
+                            is_repo = True
+                        elif entry.name not in IGNORE_DIRS:
+                            subdirs.append(entry.path)
+            except OSError:
+                continue
+            
+            # Don't descend into a repository's working tree
+            if is_repo:
                 repos.append(dirpath)
-                dirnames.remove('.git')
+                continue
             
-            depth = dirpath.replace(root_dir, '').count(os.sep)
-            if depth >= max_depth:
-                del dirnames[:]
+            if depth < max_depth:
+                # Reversed so the stack pops directories in listing order
+                stack.extend((d, depth + 1) for d in reversed(subdirs))
                 
         return repos
     @staticmethod
+    def save_avatar_cache(avatars):
+        if avatars:
+            _save_avatar_cache(avatars)
+
+    @staticmethod
     def get_git_config_user():
         try:
             import subprocess
@@ -2,9 +2,16 @@ import argparse
 import os
 import sys
 import webbrowser
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from .analyzer import GitAnalyzer
 from .renderer import DashboardRenderer
 
+def _analyze(path, use_cache=True):
+    # Runs in a worker process; results are pickled back to the parent. New avatar
+    # lookups are returned rather than written so the parent persists them once.
+    analyzer = GitAnalyzer(path, use_cache=use_cache, persist_avatars=False)
+    return analyzer.get_stats(), analyzer.new_avatars
+
 def main():
     parser = argparse.ArgumentParser(
         description="Commit Pulse - Premium Git Repository Analytics Dashboard"
@@ -29,6 +36,12 @@ def main():
         help="Do not automatically open the dashboard in the browser"
     )
     
+    parser.add_argument(
+        '--no-cache', 
+        action='store_true', 
+        help="Re-analyze every repository instead of reusing stats cached for unchanged history"
+    )
+    
     parser.add_argument(
         '--local', 
         action='store_true', 
@@ -59,13 +72,21 @@ def main():
         repo_paths = GitAnalyzer.scan_for_repos(args.path)
         print(f"Found {len(repo_paths)} repositories.")
         
-        for p in repo_paths:
-            analyzer = GitAnalyzer(p)
-            stats = analyzer.get_stats()
-            if stats:
-                all_stats.append(stats)
+        # Repos are independent, so analyze them in parallel and keep scan order
+        if repo_paths:
+            results = [None] * len(repo_paths)
+            new_avatars = {}
+            max_workers = min(len(repo_paths), os.cpu_count() or 1)
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                futures = {executor.submit(_analyze, p, not args.no_cache): i for i, p in enumerate(repo_paths)}
+                for future in as_completed(futures):
+                    stats, avatars = future.result()
+                    results[futures[future]] = stats
+                    new_avatars.update(avatars)
+            GitAnalyzer.save_avatar_cache(new_avatars)
+            all_stats.extend(stats for stats in results if stats)
     else:
-        analyzer = GitAnalyzer(args.path)
+        analyzer = GitAnalyzer(args.path, use_cache=not args.no_cache)
         if not analyzer.is_git_repo():
             print(f"Error: {os.path.abspath(args.path)} is not a git repository.")
             print("Tip: Use '--scan' to find and analyze all git repositories in this folder.")